@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -5,13 +6,42 @@ import matplotlib
 
 matplotlib.use("Agg")  # use non-interactive backend for headless environments
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
 
-CLEAN_PATH = Path("data/summarized_activities_clean.csv")
+CLEAN_PATH = Path("data/summarized_activities_clean.parquet")
 FIG_DIR = Path("data/figures")
+SPORT_GROUPS = {"TRAINING": "FITNESS_EQUIPMENT"}
+
+# Batch chart dumps: skip auto layout, simplify long paths, and write PNGs with
+# fast zlib compression (slightly larger files, much quicker saves).
+plt.rcParams.update(
+    {
+        "figure.autolayout": False,
+        "agg.path.chunksize": 10000,
+        "path.simplify": True,
+        "path.simplify_threshold": 1.0,
+    }
+)
+SAVE_KWARGS: dict[str, Any] = {"dpi": 150, "pil_kwargs": {"compress_level": 1}}
+
+
+def load_cleaned_data(
+    path: Path = CLEAN_PATH, use_pyarrow: bool = False
+) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        # Parquet keeps dtypes, so datetimes come back already typed. Memory
+        # mapping lets repeat runs read straight from the OS page cache.
+        return pd.read_parquet(path, engine="pyarrow", memory_map=True)
+
+    if use_pyarrow:
+        # Arrow infers ISO timestamps natively, so no to_datetime pass needed.
+        with pa.memory_map(str(path), "r") as source:
+            return pacsv.read_csv(source).to_pandas()
 
-
-def load_cleaned_data(path: Path = CLEAN_PATH) -> pd.DataFrame:
     df = pd.read_csv(path, low_memory=False)
     for col in ["start_time_local", "start_time_gmt", "begin_time"]:
         if col in df.columns:
@@ -21,9 +51,14 @@ def load_cleaned_data(path: Path = CLEAN_PATH) -> pd.DataFrame:
 
 def apply_sport_groups(df: pd.DataFrame) -> pd.DataFrame:
     """Combine similar sport labels for clearer charts."""
-    df = df.copy()
+    # Shallow copy: adding a column never touches the caller's column data.
+    df = df.copy(deep=False)
     if "sportType" in df:
-        df["sport_group"] = df["sportType"].replace({"TRAINING": "FITNESS_EQUIPMENT"})
+        # Mapping a categorical only visits its categories, not every row.
+        sport = df["sportType"].astype("category")
+        sport_group = sport.map(lambda s: SPORT_GROUPS.get(s, s)).astype("category")
+        # A one-to-one map keeps every original category; drop ones not present.
+        df["sport_group"] = sport_group.cat.remove_unused_categories()
     return df
 
 
@@ -32,43 +67,54 @@ def drop_container_activities(df: pd.DataFrame) -> pd.DataFrame:
     Remove multisport container rows from totals/plots.
     Containers are usually sportType MULTISPORT or flagged as parent=True.
     """
-    mask_container = False
+    mask_container = np.zeros(len(df), dtype=bool)
     if "sportType" in df:
-        mask_container |= df["sportType"].eq("MULTISPORT")
+        np.logical_or(
+            mask_container, df["sportType"].eq("MULTISPORT").to_numpy(), out=mask_container
+        )
     if "parent" in df:
-        mask_container |= df["parent"].fillna(False)
-    return df.loc[~mask_container].copy()
+        np.logical_or(
+            mask_container,
+            df["parent"].fillna(False).to_numpy(dtype=bool),
+            out=mask_container,
+        )
+    return df.iloc[~mask_container]
 
 
 def filter_year(df: pd.DataFrame, year: int) -> pd.DataFrame:
     """Keep only activities whose local start time is in the given year."""
     if "start_time_local" not in df:
         return df
-    return df[df["start_time_local"].dt.year == year].copy()
+    return df[df["start_time_local"].dt.year == year]
 
 
-def run_analysis(clean_path: Path, year: int | None = 2025) -> None:
+def run_analysis(
+    clean_path: Path, year: int | None = 2025, use_pyarrow: bool = False
+) -> None:
     """
     End-to-end analysis pipeline:
-    - load cleaned CSV
+    - load cleaned Parquet/CSV (CSV via PyArrow when use_pyarrow is set)
     - optional year filter
     - drop containers and apply sport grouping
     - generate stats and charts
     """
-    df = load_cleaned_data(clean_path)
+    df = load_cleaned_data(clean_path, use_pyarrow=use_pyarrow)
     if year is not None:
         df = filter_year(df, year)
     df = drop_container_activities(df)
     df = apply_sport_groups(df)
-    stats = compute_stats(df)
+
+    # Aggregate once up front; stats and charts share the prebuilt results.
+    aggregates = build_aggregates(df)
+    stats = compute_stats(df, aggregates)
 
     FIG_DIR.mkdir(parents=True, exist_ok=True)
-    plot_activity_counts(df)
-    plot_distance_over_time(df)
+    plot_activity_counts(aggregates.sport_counts)
+    plot_distance_over_time(aggregates.daily_distance)
     plot_heart_rate_hist(df)
-    plot_duration_by_sport(df)
+    plot_duration_by_sport(aggregates.sport_median_duration)
     plot_hr_zone_distribution(df)
-    plot_weekly_totals(df)
+    plot_weekly_totals(aggregates.weekly_totals)
 
     print("Key stats:")
     for key, value in stats.items():
@@ -76,12 +122,50 @@ def run_analysis(clean_path: Path, year: int | None = 2025) -> None:
 
     print(f"\nCharts saved to {FIG_DIR}")
 
-def compute_stats(df: pd.DataFrame) -> dict[str, Any]:
+
+@dataclass(frozen=True)
+class Aggregates:
+    """Per-run aggregations shared by compute_stats and the charts."""
+
+    sport_counts: pd.Series  # sorted descending, like value_counts
+    sport_median_duration: pd.Series
+    daily_distance: pd.Series
+    weekly_totals: pd.DataFrame
+
+
+def build_aggregates(df: pd.DataFrame) -> Aggregates:
+    by_sport = summarize_by_sport(df)
+    empty = pd.Series(dtype="float64")
+    sport_counts = by_sport.get("count", empty).sort_values(ascending=False)
+    return Aggregates(
+        sport_counts=sport_counts,
+        sport_median_duration=by_sport.get("median_duration", empty),
+        daily_distance=daily_distance(df),
+        weekly_totals=weekly_totals(df),
+    )
+
+
+def _as_float(scalar: pa.Scalar) -> float:
+    value = scalar.as_py()
+    return float("nan") if value is None else float(value)
+
+
+def _median(values: pa.Array) -> float:
+    # Exact median (linear interpolation), matching Series.median.
+    return _as_float(pc.quantile(values, q=0.5)[0])
+
+
+def compute_stats(
+    df: pd.DataFrame, aggregates: Aggregates | None = None
+) -> dict[str, Any]:
+    # Arrow kernels skip nulls via the validity bitmap, so no fillna copies;
+    # pa.array maps NaN to null when given a pandas Series.
     stats: dict[str, Any] = {}
+    cols = set(df.columns)
 
     stats["activity_count"] = len(df)
 
-    if "start_time_local" in df:
+    if "start_time_local" in cols:
         start_dates = df["start_time_local"].dropna()
         if not start_dates.empty:
             stats["date_range"] = (
@@ -89,51 +173,98 @@ def compute_stats(df: pd.DataFrame) -> dict[str, Any]:
                 start_dates.max().date().isoformat(),
             )
 
-    if "distance_mi" in df:
-        stats["total_miles"] = round(df["distance_mi"].fillna(0).sum(), 2)
-        stats["median_miles"] = round(df["distance_mi"].median(), 2)
+    if "distance_mi" in cols:
+        miles = pa.array(df["distance_mi"])
+        stats["total_miles"] = round(pc.sum(miles, min_count=0).as_py(), 2)
+        stats["median_miles"] = round(_median(miles), 2)
 
-    if "duration_minutes" in df:
-        total_hours = df["duration_minutes"].fillna(0).sum() / 60
+    if "duration_minutes" in cols:
+        minutes = pa.array(df["duration_minutes"])
+        total_hours = pc.sum(minutes, min_count=0).as_py() / 60
         stats["total_hours"] = round(total_hours, 2)
-        stats["median_duration_min"] = round(df["duration_minutes"].median(), 2)
+        stats["median_duration_min"] = round(_median(minutes), 2)
 
-    if "calories" in df:
-        stats["total_calories"] = int(df["calories"].fillna(0).sum())
+    if "calories" in cols:
+        stats["total_calories"] = int(pc.sum(pa.array(df["calories"]), min_count=0).as_py())
 
-    if "avgHr" in df:
-        stats["avg_heart_rate"] = round(df["avgHr"].mean(), 1)
-        stats["max_heart_rate"] = int(df["maxHr"].max()) if "maxHr" in df else None
+    if "avgHr" in cols:
+        stats["avg_heart_rate"] = round(_as_float(pc.mean(pa.array(df["avgHr"]))), 1)
+        stats["max_heart_rate"] = (
+            int(pc.max(pa.array(df["maxHr"])).as_py()) if "maxHr" in cols else None
+        )
 
-    if "sport_group" in df:
-        stats["top_sports"] = df["sport_group"].value_counts().head(5).to_dict()
+    if "sport_group" in cols:
+        if aggregates is None:
+            # Same observed-only counts that build_aggregates would produce.
+            sport_counts = summarize_by_sport(df)["count"].sort_values(ascending=False)
+        else:
+            sport_counts = aggregates.sport_counts
+        stats["top_sports"] = sport_counts.head(5).to_dict()
 
     return stats
 
 
-def plot_activity_counts(df: pd.DataFrame) -> None:
+def summarize_by_sport(df: pd.DataFrame) -> pd.DataFrame:
+    """Activity count and median duration per sport group from one groupby."""
     if "sport_group" not in df:
-        return
-    top = df["sport_group"].value_counts().head(10)
-    plt.figure(figsize=(8, 5))
-    top.plot(kind="bar", color="#4C6FFF")
-    plt.title("Activity Count by Sport")
-    plt.ylabel("Count")
-    plt.tight_layout()
-    plt.savefig(FIG_DIR / "activity_counts.png", dpi=150)
-    plt.close()
+        return pd.DataFrame()
+    grouped = df.groupby("sport_group", observed=True)
+    summary = grouped.size().to_frame("count")
+    if "duration_minutes" in df:
+        summary["median_duration"] = grouped["duration_minutes"].median()
+    return summary
 
 
-def plot_distance_over_time(df: pd.DataFrame) -> None:
+def daily_distance(df: pd.DataFrame) -> pd.Series:
+    """Total miles per calendar day."""
     if "start_time_local" not in df or "distance_mi" not in df:
-        return
-    daily = (
+        return pd.Series(dtype="float64")
+    return (
         df.dropna(subset=["start_time_local"])
-        .assign(date=lambda d: d["start_time_local"].dt.date)
+        # Day-resolution datetime64 keys keep groupby off the object-hash path.
+        .assign(date=lambda d: d["start_time_local"].to_numpy().astype("datetime64[D]"))
         .groupby("date")["distance_mi"]
         .sum()
         .sort_index()
     )
+
+
+def weekly_totals(df: pd.DataFrame) -> pd.DataFrame:
+    """Weekly distance/time sums, computed together in a single groupby."""
+    if "start_time_local" not in df:
+        return pd.DataFrame()
+    value_cols = [c for c in ["distance_mi", "duration_minutes"] if c in df]
+    if not value_cols:
+        return pd.DataFrame()
+
+    temp = df.dropna(subset=["start_time_local"])
+    # NumPy weeks are epoch-aligned (Thursdays); shift by 3 days so the floor
+    # lands on Monday, matching to_period("W") without building a PeriodIndex.
+    shift = np.timedelta64(3, "D")
+    days = temp["start_time_local"].to_numpy().astype("datetime64[D]")
+    week_start = (days + shift).astype("datetime64[W]").astype("datetime64[D]") - shift
+    return (
+        temp.groupby(week_start)[value_cols]
+        .sum()
+        .rename_axis("week_start")
+        .sort_index()
+    )
+
+
+def plot_activity_counts(counts: pd.Series) -> None:
+    if counts.empty:
+        return
+    top = counts.head(10)
+    plt.figure(figsize=(8, 5))
+    top.plot(kind="bar", color="#4C6FFF")
+    plt.title("Activity Count by Sport")
+    plt.ylabel("Count")
+    plt.subplots_adjust(bottom=0.42, left=0.12)
+    plt.savefig(FIG_DIR / "activity_counts.png", **SAVE_KWARGS)
+    plt.close()
+
+
+def plot_distance_over_time(daily: pd.Series) -> None:
     if daily.empty:
         return
     plt.figure(figsize=(10, 4))
@@ -141,43 +272,44 @@ def plot_distance_over_time(df: pd.DataFrame) -> None:
     plt.title("Distance per Day (miles)")
     plt.xlabel("Date")
     plt.ylabel("Miles")
-    plt.tight_layout()
-    plt.savefig(FIG_DIR / "distance_over_time.png", dpi=150)
+    plt.subplots_adjust(bottom=0.18, left=0.12)
+    plt.savefig(FIG_DIR / "distance_over_time.png", **SAVE_KWARGS)
     plt.close()
 
 
 def plot_heart_rate_hist(df: pd.DataFrame) -> None:
     if "avgHr" not in df:
         return
+    # Bin directly in NumPy; the NaN mask avoids a dropna copy of the Series.
+    avg_hr = df["avgHr"].to_numpy(dtype=np.float64, na_value=np.nan)
+    counts, edges = np.histogram(avg_hr[~np.isnan(avg_hr)], bins=20)
     plt.figure(figsize=(8, 4))
-    df["avgHr"].dropna().plot(kind="hist", bins=20, color="#00A676", edgecolor="black")
+    plt.bar(
+        edges[:-1],
+        counts,
+        width=np.diff(edges),
+        align="edge",
+        color="#00A676",
+        edgecolor="black",
+    )
     plt.title("Average Heart Rate Distribution")
     plt.xlabel("BPM")
     plt.ylabel("Count")
-    plt.tight_layout()
-    plt.savefig(FIG_DIR / "heart_rate_hist.png", dpi=150)
+    plt.subplots_adjust(bottom=0.18, left=0.12)
+    plt.savefig(FIG_DIR / "heart_rate_hist.png", **SAVE_KWARGS)
     plt.close()
 
 
-def plot_duration_by_sport(df: pd.DataFrame) -> None:
-    if "duration_minutes" not in df or "sport_group" not in df:
-        return
-    agg = (
-        df[["sport_group", "duration_minutes"]]
-        .dropna()
-        .groupby("sport_group")["duration_minutes"]
-        .median()
-        .sort_values(ascending=False)
-        .head(10)
-    )
+def plot_duration_by_sport(median_duration: pd.Series) -> None:
+    agg = median_duration.dropna().sort_values(ascending=False).head(10)
     if agg.empty:
         return
     plt.figure(figsize=(8, 5))
     agg.plot(kind="bar", color="#F2C94C")
     plt.title("Median Duration by Sport (minutes)")
     plt.ylabel("Minutes")
-    plt.tight_layout()
-    plt.savefig(FIG_DIR / "median_duration_by_sport.png", dpi=150)
+    plt.subplots_adjust(bottom=0.42, left=0.12)
+    plt.savefig(FIG_DIR / "median_duration_by_sport.png", **SAVE_KWARGS)
     plt.close()
 
 
@@ -189,55 +321,43 @@ def plot_hr_zone_distribution(df: pd.DataFrame) -> None:
     if not zone_cols:
         return
 
-    totals_min = df[zone_cols].fillna(0).sum() / 60000  # ms -> minutes
-    labels = [f"Zone {c.split('_')[-1]}" for c in totals_min.index]
+    # One pass over a contiguous float array; NaNs become 0 without a fillna copy.
+    zone_ms = df[zone_cols].to_numpy(dtype=np.float64, na_value=0.0)
+    totals_min = zone_ms.sum(axis=0) / 60000  # ms -> minutes
+    labels = [f"Zone {c.split('_')[-1]}" for c in zone_cols]
 
     plt.figure(figsize=(8, 4))
-    plt.bar(labels, totals_min.values, color="#7B61FF")
+    plt.bar(labels, totals_min, color="#7B61FF")
     plt.title("Total Time in Heart Rate Zones")
     plt.ylabel("Minutes")
-    plt.tight_layout()
-    plt.savefig(FIG_DIR / "hr_zone_distribution.png", dpi=150)
+    plt.subplots_adjust(bottom=0.18, left=0.12)
+    plt.savefig(FIG_DIR / "hr_zone_distribution.png", **SAVE_KWARGS)
     plt.close()
 
 
-def plot_weekly_totals(df: pd.DataFrame) -> None:
-    if "start_time_local" not in df:
-        return
-
-    temp = df.dropna(subset=["start_time_local"]).copy()
-    temp["week_start"] = temp["start_time_local"].dt.to_period("W").dt.start_time
-
-    if "distance_mi" in temp:
-        weekly_dist = (
-            temp.groupby("week_start")["distance_mi"]
-            .sum()
-            .sort_index()
-        )
+def plot_weekly_totals(weekly: pd.DataFrame) -> None:
+    if "distance_mi" in weekly:
+        weekly_dist = weekly["distance_mi"]
         if not weekly_dist.empty:
             plt.figure(figsize=(10, 4))
             plt.plot(weekly_dist.index, weekly_dist.values, color="#4C6FFF")
             plt.title("Weekly Distance (miles)")
             plt.xlabel("Week starting")
             plt.ylabel("Miles")
-            plt.tight_layout()
-            plt.savefig(FIG_DIR / "weekly_distance.png", dpi=150)
+            plt.subplots_adjust(bottom=0.18, left=0.12)
+            plt.savefig(FIG_DIR / "weekly_distance.png", **SAVE_KWARGS)
             plt.close()
 
-    if "duration_minutes" in temp:
-        weekly_dur = (
-            temp.groupby("week_start")["duration_minutes"]
-            .sum()
-            .sort_index()
-        )
+    if "duration_minutes" in weekly:
+        weekly_dur = weekly["duration_minutes"]
         if not weekly_dur.empty:
             plt.figure(figsize=(10, 4))
             plt.plot(weekly_dur.index, weekly_dur.values, color="#FF7A59")
             plt.title("Weekly Time (minutes)")
             plt.xlabel("Week starting")
             plt.ylabel("Minutes")
-            plt.tight_layout()
-            plt.savefig(FIG_DIR / "weekly_time.png", dpi=150)
+            plt.subplots_adjust(bottom=0.18, left=0.12)
+            plt.savefig(FIG_DIR / "weekly_time.png", **SAVE_KWARGS)
             plt.close()
 
 